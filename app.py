@@ -13,6 +13,8 @@ from src.config import settings, logger
 from src.parser import extract_elements
 from src.vectorstore import get_vectorstore
 from src.engine import get_rag_chain
+from src.llm import get_llm, Priority
+from src.memory import ConversationMemory
 
 st.set_page_config(page_title="RAG :SmartDataSolutionsLLC", page_icon="📊", layout="wide")
 
@@ -25,6 +27,11 @@ if "messages" not in st.session_state:
 if "rag_chain" not in st.session_state:
     st.session_state.rag_chain = None
 
+if "memory" not in st.session_state:
+    st.session_state.memory = ConversationMemory(
+        get_llm(temperature=0.0, priority=Priority.BATCH)
+    )
+
 with st.sidebar:
     st.header("Settings")
     uploaded_file = st.file_uploader("Upload a PDF", type="pdf")
@@ -58,6 +65,7 @@ with st.sidebar:
 
     if st.button("Clear Chat"):
         st.session_state.messages = []
+        st.session_state.memory.clear()
         st.rerun()
 
 
@@ -84,13 +92,11 @@ if query := st.chat_input("Ask a question about the document..."):
         with st.chat_message("assistant"):
             with st.spinner("Analyzing..."):
 
-                chat_history = [
-                    (m["role"], m["content"]) for m in st.session_state.messages[-10:]
-                ]
+                chat_history = st.session_state.memory.get_history()
                 
                 try:
                     result = st.session_state.rag_chain.invoke(
-                        {"input": query, "chat_history": chat_history[:-1]} 
+                        {"input": query, "chat_history": chat_history}
                     )
                     
                     answer = result["answer"]
@@ -108,6 +114,7 @@ if query := st.chat_input("Ask a question about the document..."):
                                 st.divider()
                     
                     st.session_state.messages.append({"role": "assistant", "content": answer})
+                    st.session_state.memory.add_turn(query, answer)
 
                 except Exception as e:
                     logger.error(f"Inference error: {e}")
@@ -0,0 +1,84 @@
+'''
+Offline load test for the RAG pipeline.
+
+This script runs several simulated users against the full conversational
+chain (retrieval, contextualization, answering and history summarization)
+and reports latency and throughput. By default it uses the local stand-in
+model, so no API key or network access is needed.
+'''
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from src.config import settings, logger
+from src.vectorstore import get_vectorstore
+from src.engine import get_rag_chain
+from src.llm import get_llm, Priority
+from src.memory import ConversationMemory
+
+
+QUESTIONS = [
+    "What was the total net sales for the latest fiscal year?",
+    "How does that compare to the previous year?",
+    "Which product category contributed the most?",
+    "What were the main risk factors mentioned?",
+    "Summarize the operating expenses.",
+]
+
+
+def run_user(rag_chain, turns: int) -> List[float]:
+    memory = ConversationMemory(get_llm(temperature=0.0, priority=Priority.BATCH))
+    latencies = []
+
+    for i in range(turns):
+        query = QUESTIONS[i % len(QUESTIONS)]
+        start = time.perf_counter()
+        result = rag_chain.invoke({"input": query, "chat_history": memory.get_history()})
+        latencies.append(time.perf_counter() - start)
+        memory.add_turn(query, result["answer"])
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the RAG pipeline.")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=5, help="Questions asked per user")
+    parser.add_argument(
+        "--provider",
+        default="local",
+        help="LLM provider to test against (default: local stand-in)",
+    )
+    args = parser.parse_args()
+
+    settings.LLM_PROVIDER = args.provider
+
+    vectorstore = get_vectorstore()
+    if vectorstore is None:
+        logger.error("FAISS Index not found. Run main.py first to ingest a PDF.")
+        return
+
+    rag_chain = get_rag_chain(vectorstore)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        results = list(pool.map(lambda _: run_user(rag_chain, args.turns), range(args.users)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for user in results for latency in user)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    print("\n" + "=" * 50)
+    print(f"Provider: {args.provider} | Users: {args.users} | Turns: {args.turns}")
+    print("=" * 50)
+    print(f"Queries:     {len(latencies)}")
+    print(f"Wall time:   {elapsed:.2f}s")
+    print(f"Throughput:  {len(latencies) / elapsed:.2f} queries/s")
+    print(f"Latency p50: {statistics.median(latencies) * 1000:.0f}ms")
+    print(f"Latency p95: {p95 * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ from src.config import settings, logger
 from src.parser import extract_elements
 from src.vectorstore import get_vectorstore
 from src.engine import get_rag_chain
+from src.llm import get_llm, Priority
+from src.memory import ConversationMemory
 
 
 def main():
@@ -27,7 +29,7 @@ def main():
 
     rag_chain = get_rag_chain(vectorstore)
 
-    chat_history = []
+    memory = ConversationMemory(get_llm(temperature=0.0, priority=Priority.BATCH))
 
     print("\n" + "=" * 50)
     print("RAG by SmartDataSolutionsLLC")
@@ -44,7 +46,9 @@ def main():
             break
 
         try:
-            result = rag_chain.invoke({"input": query, "chat_history": chat_history})
+            result = rag_chain.invoke(
+                {"input": query, "chat_history": memory.get_history()}
+            )
             
             answer = result["answer"]
             sources = result["source_documents"]
@@ -59,11 +63,7 @@ def main():
                     print(f" - Content: {page_content[:100]}...") 
                     print(f" - Source {i+1}: Page {pg}")
 
-            chat_history.append(("human", query))
-            chat_history.append(("assistant", answer))
-
-            if len(chat_history) > 10:
-                chat_history = chat_history[-10:]
+            memory.add_turn(query, answer)
 
         except Exception as e:
             logger.error(f"Error during inference: {e}")
@@ -18,8 +18,8 @@ class Settings(BaseSettings):
 
     """
 
-    GROQ_API_KEY: str
-    GROQ_MODEL: str
+    GROQ_API_KEY: Optional[str] = None
+    GROQ_MODEL: Optional[str] = None
     EMBEDDING_MODEL: str
     FAISS_INDEX_DIR: str
     PDF_PATH: str
@@ -28,6 +28,19 @@ class Settings(BaseSettings):
     TESSERACT_PATH: Optional[str] = None
     PROMPTS_FILE: str = "prompts.toml"
 
+    HISTORY_MAX_TOKENS: int = 1500
+    HISTORY_SUMMARY_MAX_TOKENS: int = 300
+
+    LLM_PROVIDER: str = "groq"
+    LLM_REQUEST_TIMEOUT: float = 30.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 12000
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 512
+    LOCAL_LLM_LATENCY_MS: int = 0
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -41,6 +54,8 @@ class Settings(BaseSettings):
 
         all_valid = True
         for name, path in paths_to_check.items():
+            if path is None:
+                continue
             if not Path(path).exists():
                 logger.warning(f"{name} not found at: {path}")
                 all_valid = False
@@ -7,12 +7,12 @@ handling context retrieval, query contextualization, and answer generation.
 
 from typing import List, Dict, Any
 from operator import itemgetter
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda, RunnableParallel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
-from src.config import settings, logger, load_prompts
+from src.config import logger, load_prompts
+from src.llm import get_llm
 
 
 def validate_input(input_dict: Dict[str, Any]) -> bool:
@@ -59,12 +59,7 @@ def get_rag_chain(vectorstore, temperature: float = 0.1, k: int = 5):
     try:
         prompts = load_prompts()
 
-        llm = ChatGroq(
-            groq_api_key=settings.GROQ_API_KEY,
-            model_name=settings.GROQ_MODEL,
-            temperature=temperature,
-        )
-        logger.info(f"LLM initialized: {settings.GROQ_MODEL} (temp={temperature})")
+        llm = get_llm(temperature)
 
         retriever = vectorstore.as_retriever(search_kwargs={"k": k})
         logger.info(f"Retriever configured: k={k}")
@@ -0,0 +1,381 @@
+"""
+LLM provider module.
+
+This module builds the chat models used by the RAG pipeline. Every call goes
+through a shared scheduler that orders requests by priority and keeps them
+within the provider's requests-per-minute and tokens-per-minute budgets.
+Groq models reuse a pooled keep-alive HTTP client, and a deterministic local
+stand-in model allows the full pipeline to be exercised offline.
+"""
+
+import groq
+import hashlib
+import heapq
+import itertools
+import threading
+import time
+import httpx
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+from langchain_groq import ChatGroq
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    convert_to_messages,
+    get_buffer_string,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from src.config import settings, logger
+from src.utils import estimate_tokens
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 10
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously up to its capacity.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                return 0.0
+            return (amount - self._tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        # The balance may go negative when actual usage exceeds the estimate;
+        # later requests then wait until the debt is repaid.
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class RateLimiter:
+    """
+    Combined requests-per-minute and tokens-per-minute limiter.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._lock = threading.Lock()
+
+    def reservation(self, tokens: int) -> int:
+        # Requests larger than the per-minute budget reserve the full budget
+        # rather than waiting forever.
+        return min(tokens, int(self.tokens.capacity))
+
+    def try_acquire(self, tokens: int) -> float:
+        tokens = self.reservation(tokens)
+        with self._lock:
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait == 0:
+                self.requests.consume(1)
+                self.tokens.consume(tokens)
+            return wait
+
+    def adjust(self, delta: int) -> None:
+        self.tokens.consume(delta)
+
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Returns the seconds to wait before retrying a failed call, or None when
+    the error is not worth retrying.
+    """
+    backoff = min(0.5 * 2**attempt, 8.0)
+
+    if isinstance(error, groq.RateLimitError):
+        headers = error.response.headers
+        for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+            try:
+                return float(headers.get(header)) / scale
+            except (TypeError, ValueError):
+                pass
+        return backoff
+
+    if isinstance(error, groq.APIStatusError):
+        if error.status_code in (408, 409) or error.status_code >= 500:
+            return backoff
+        return None
+
+    if isinstance(error, groq.APIConnectionError):
+        return backoff
+
+    return None
+
+
+class LLMScheduler:
+    """
+    Priority queue of LLM calls dispatched to a fixed pool of worker threads.
+
+    A single dispatcher only takes a call off the queue once a worker is free
+    and the rate limiter has granted budget, so queued interactive requests
+    always go ahead of queued batch requests. Failed calls are retried
+    through the same queue, and a provider rate-limit error pauses dispatch
+    for every queued call until the provider's retry-after period has passed.
+    """
+
+    def __init__(self, limiter: RateLimiter, max_concurrency: int, max_retries: int = 0):
+        self.limiter = limiter
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-worker"
+        )
+
+        dispatcher = threading.Thread(
+            target=self._dispatch, name="llm-dispatcher", daemon=True
+        )
+        dispatcher.start()
+
+    def submit(self, fn: Callable[[], Any], priority: Priority, tokens: int) -> Future:
+        future: Future = Future()
+        with self._cond:
+            heapq.heappush(
+                self._heap, (int(priority), next(self._counter), fn, tokens, future, 0)
+            )
+            self._cond.notify()
+        return future
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._active >= self.max_concurrency:
+                    self._cond.wait()
+
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(timeout=pause)
+                    continue
+
+                entry = self._heap[0]
+                _, _, fn, tokens, future, attempt = entry
+                if future.cancelled():
+                    heapq.heappop(self._heap)
+                    continue
+
+                wait = self.limiter.try_acquire(tokens)
+                if wait > 0:
+                    # New submissions wake the dispatcher early, so a more
+                    # urgent call is considered before the budget is spent.
+                    self._cond.wait(timeout=wait)
+                    continue
+
+                heapq.heappop(self._heap)
+                reserved = self.limiter.reservation(tokens)
+                # Retried calls are already running from their caller's view.
+                if attempt == 0 and not future.set_running_or_notify_cancel():
+                    self.limiter.adjust(-reserved)
+                    continue
+                self._active += 1
+
+            self._executor.submit(self._run, entry, reserved)
+
+    def _run(self, entry: tuple, reserved: int) -> None:
+        priority, seq, fn, tokens, future, attempt = entry
+        try:
+            result = fn()
+        except Exception as e:
+            delay = retry_delay(e, attempt)
+            if delay is None or attempt >= self.max_retries:
+                future.set_exception(e)
+                return
+
+            if isinstance(e, groq.RateLimitError):
+                logger.warning(f"LLM rate limit hit; pausing dispatch for {delay:.1f}s")
+                with self._cond:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            else:
+                logger.warning(f"LLM call failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+            # Requeue with the original sequence number so the call keeps its
+            # place among calls of the same priority.
+            with self._cond:
+                heapq.heappush(self._heap, (priority, seq, fn, tokens, future, attempt + 1))
+        else:
+            usage = getattr(result, "usage_metadata", None)
+            if usage and usage.get("total_tokens"):
+                self.limiter.adjust(usage["total_tokens"] - reserved)
+            future.set_result(result)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify()
+
+
+class ScheduledChatModel(Runnable[LanguageModelInput, BaseMessage]):
+    """
+    Runnable that routes chat model calls through the shared scheduler.
+    """
+
+    def __init__(self, model: BaseChatModel, scheduler: LLMScheduler, priority: Priority):
+        self.model = model
+        self.scheduler = scheduler
+        self.priority = priority
+
+    def invoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseMessage:
+        if isinstance(input, str):
+            messages = [HumanMessage(content=input)]
+        else:
+            messages = convert_to_messages(input)
+        estimated = (
+            estimate_tokens(get_buffer_string(messages))
+            + settings.LLM_EXPECTED_OUTPUT_TOKENS
+        )
+
+        future = self.scheduler.submit(
+            lambda: self.model.invoke(messages, config, **kwargs),
+            self.priority,
+            estimated,
+        )
+
+        # Bound the wait for queueing plus the client's own retry attempts.
+        deadline = settings.LLM_REQUEST_TIMEOUT * (settings.LLM_MAX_RETRIES + 1)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.error(f"LLM call timed out after {deadline:.0f}s")
+            raise TimeoutError(f"LLM call timed out after {deadline:.0f}s")
+
+
+class LocalChatModel(BaseChatModel):
+    """
+    Deterministic offline stand-in for the hosted chat model.
+
+    The reply depends only on the prompt, which keeps load tests repeatable.
+    """
+
+    latency_ms: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "local-stand-in"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        prompt = "\n".join(str(m.content) for m in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+
+        question = next(
+            (str(m.content) for m in reversed(messages) if isinstance(m, HumanMessage)),
+            "",
+        )
+        content = f"[local:{digest}] {question}"
+
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(content)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+
+    client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            keepalive_expiry=60.0,
+        ),
+        timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT, connect=5.0),
+    )
+    logger.info(f"HTTP client pool created: max_connections={settings.LLM_MAX_CONNECTIONS}")
+
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> LLMScheduler:
+
+    limiter = RateLimiter(
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    )
+    logger.info(
+        f"LLM scheduler started: rpm={settings.LLM_REQUESTS_PER_MINUTE}, "
+        f"tpm={settings.LLM_TOKENS_PER_MINUTE}, workers={settings.LLM_MAX_CONCURRENCY}"
+    )
+
+    return LLMScheduler(limiter, settings.LLM_MAX_CONCURRENCY, settings.LLM_MAX_RETRIES)
+
+
+def get_llm(
+    temperature: float = 0.1, priority: Priority = Priority.INTERACTIVE
+) -> ScheduledChatModel:
+
+    provider = settings.LLM_PROVIDER.lower()
+
+    if provider == "local":
+        model = LocalChatModel(latency_ms=settings.LOCAL_LLM_LATENCY_MS)
+        logger.info(f"LLM initialized: local stand-in (latency={settings.LOCAL_LLM_LATENCY_MS}ms)")
+    elif provider == "groq":
+        if not settings.GROQ_API_KEY or not settings.GROQ_MODEL:
+            raise ValueError("GROQ_API_KEY and GROQ_MODEL must be set when LLM_PROVIDER=groq")
+
+        model = ChatGroq(
+            groq_api_key=settings.GROQ_API_KEY,
+            model_name=settings.GROQ_MODEL,
+            temperature=temperature,
+            # Retries go through the scheduler so they respect the shared
+            # rate limits.
+            max_retries=0,
+            request_timeout=settings.LLM_REQUEST_TIMEOUT,
+            http_client=get_http_client(),
+        )
+        logger.info(f"LLM initialized: {settings.GROQ_MODEL} (temp={temperature})")
+    else:
+        raise ValueError(f"Unknown LLM provider: {settings.LLM_PROVIDER}")
+
+    return ScheduledChatModel(model, get_scheduler(), priority)
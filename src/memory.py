@@ -0,0 +1,169 @@
+"""
+Conversation memory module.
+
+This module keeps the chat history passed to the RAG chain bounded in size:
+recent turns are kept verbatim inside a token budget, while older turns are
+folded into a rolling summary that is updated in the background.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from src.config import settings, logger, load_prompts
+from src.utils import estimate_tokens, truncate_to_tokens
+
+
+class ConversationMemory:
+    """
+    Token-aware chat history with an incrementally maintained summary.
+
+    Turns that fall out of the window are summarized on a single background
+    worker, so answering a question never waits on the summarizer.
+    """
+
+    def __init__(
+        self,
+        llm,
+        max_tokens: int = settings.HISTORY_MAX_TOKENS,
+        summary_max_tokens: int = settings.HISTORY_SUMMARY_MAX_TOKENS,
+    ):
+        prompts = load_prompts()
+        summarize_prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", prompts["memory"]["summarize_instruction"]),
+                ("human", prompts["memory"]["summarize_template"]),
+            ]
+        )
+        self._summarize_chain = summarize_prompt | llm | StrOutputParser()
+
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = summary_max_tokens
+
+        self._turns: List[Tuple[str, str]] = []
+        self._pending: List[Tuple[str, str]] = []
+        self._summary = ""
+        self._generation = 0
+        self._summarizing = False
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memory-summary"
+        )
+
+    def add_turn(self, query: str, answer: str) -> None:
+        with self._lock:
+            self._turns.append(("human", query))
+            self._turns.append(("assistant", answer))
+
+            while len(self._turns) > 2 and self._window_tokens() > self.max_tokens:
+                self._pending.extend(self._turns[:2])
+                self._turns = self._turns[2:]
+
+            if self._pending and not self._summarizing:
+                self._summarizing = True
+                self._executor.submit(self._summarize)
+
+    def get_history(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            history = []
+            if self._summary:
+                history.append(
+                    ("system", f"Summary of the earlier conversation:\n{self._summary}")
+                )
+            history.extend(
+                (role, truncate_to_tokens(content, self._per_message_tokens))
+                for role, content in self._turns
+            )
+            return history
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns = []
+            self._pending = []
+            self._summary = ""
+            self._generation += 1
+
+    @property
+    def _per_message_tokens(self) -> int:
+        # A single turn may take at most half of the window so that the
+        # latest exchange always stays verbatim. Turns are stored in full and
+        # only capped when the window is built, so the summarizer sees them
+        # untruncated.
+        return self.max_tokens // 4
+
+    def _window_tokens(self) -> int:
+        return sum(
+            min(estimate_tokens(content), self._per_message_tokens)
+            for _, content in self._turns
+        )
+
+    def _trim_pending(self) -> None:
+        # After a failed summarization the batch is retried together with
+        # everything evicted since, so drop the oldest messages to keep the
+        # retry prompt within the window budget.
+        dropped = 0
+        while (
+            len(self._pending) > 1
+            and sum(estimate_tokens(c) for _, c in self._pending) > self.max_tokens
+        ):
+            self._pending = self._pending[1:]
+            dropped += 1
+
+        if dropped:
+            logger.warning(
+                f"Dropped {dropped} oldest pending messages from the conversation summary"
+            )
+
+    def _summarize(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._summarizing = False
+                    return
+                batch = [
+                    (role, truncate_to_tokens(content, self.max_tokens))
+                    for role, content in self._pending
+                ]
+                self._pending = []
+                summary = self._summary
+                generation = self._generation
+
+            new_lines = "\n".join(f"{role}: {content}" for role, content in batch)
+
+            try:
+                updated = self._summarize_chain.invoke(
+                    {
+                        "summary": summary or "(empty)",
+                        "new_lines": new_lines,
+                        "max_words": self.summary_max_tokens * 3 // 4,
+                    }
+                ).strip()
+            except Exception as e:
+                logger.error(f"Error updating conversation summary: {e}")
+                with self._lock:
+                    if generation == self._generation:
+                        self._pending = batch + self._pending
+                        self._trim_pending()
+                    self._summarizing = False
+                return
+
+            with self._lock:
+                # The history may have been cleared while the summary was
+                # being generated; drop the stale result in that case.
+                if generation == self._generation:
+                    if estimate_tokens(updated) > self.summary_max_tokens:
+                        # Newly folded-in turns are appended at the end, so
+                        # trim the oldest part of an over-long summary.
+                        logger.warning(
+                            f"Conversation summary exceeded {self.summary_max_tokens} "
+                            "tokens; trimming its oldest content"
+                        )
+                        updated = truncate_to_tokens(
+                            updated, self.summary_max_tokens, keep_end=True
+                        )
+                    self._summary = updated
+                    logger.info(
+                        f"Conversation summary updated ({len(batch)} messages folded in)"
+                    )
@@ -0,0 +1,21 @@
+"""
+Shared helper module.
+
+This module holds small utilities used across the RAG pipeline, such as the
+character-based token estimates used for history and rate-limit budgets.
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep_end: bool = False) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    if keep_end:
+        return "..." + text[-max_chars:].lstrip()
+    return text[:max_chars].rstrip() + "..."
@@ -0,0 +1,9 @@
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("GROQ_MODEL", "test-model")
+os.environ.setdefault("EMBEDDING_MODEL", "test-embeddings")
+os.environ.setdefault("FAISS_INDEX_DIR", "faiss_index")
+os.environ.setdefault("PDF_PATH", "data/test.pdf")
+os.environ.setdefault("POPPLER_PATH", ".")
+os.environ.setdefault("TESSERACT_PATH", ".")
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+from src.config import settings
+from src.engine import get_rag_chain
+from src.llm import get_scheduler
+
+
+@pytest.fixture
+def local_provider(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "local")
+    monkeypatch.setattr(settings, "GROQ_API_KEY", None)
+    monkeypatch.setattr(settings, "LLM_REQUESTS_PER_MINUTE", 10_000)
+    monkeypatch.setattr(settings, "LLM_TOKENS_PER_MINUTE", 10_000_000)
+    get_scheduler.cache_clear()
+    yield
+    get_scheduler.cache_clear()
+
+
+def test_rag_chain_runs_offline_with_concurrent_callers(local_provider):
+    vectorstore = InMemoryVectorStore.from_documents(
+        [
+            Document(
+                page_content=f"Net sales in fiscal {2020 + i} were {300 + i} billion.",
+                metadata={"page_number": i + 1, "element_type": "Text"},
+            )
+            for i in range(10)
+        ],
+        DeterministicFakeEmbedding(size=32),
+    )
+    rag_chain = get_rag_chain(vectorstore, k=3)
+
+    def ask(i):
+        history = [("human", "What were net sales?"), ("assistant", "About 390 billion.")]
+        return rag_chain.invoke(
+            {"input": f"And in fiscal {2020 + i}?", "chat_history": history if i % 2 else []}
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(ask, range(16)))
+
+    for i, result in enumerate(results):
+        assert result["answer"].endswith(f"And in fiscal {2020 + i}?")
+        assert len(result["source_documents"]) == 3
+
+    assert rag_chain.invoke({"input": "And in fiscal 2020?", "chat_history": []}) == results[0]
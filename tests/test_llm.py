@@ -0,0 +1,137 @@
+import threading
+import time
+import groq
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from src.config import settings
+from src.llm import (
+    LLMScheduler,
+    LocalChatModel,
+    Priority,
+    RateLimiter,
+    ScheduledChatModel,
+    retry_delay,
+)
+
+
+def rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return groq.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_interactive_call_overtakes_queued_batch_calls():
+    # Ten requests per second, with the initial burst already spent.
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+    limiter.requests.consume(600)
+    scheduler = LLMScheduler(limiter, max_concurrency=2)
+
+    order = []
+    lock = threading.Lock()
+
+    def call(name):
+        def run():
+            with lock:
+                order.append(name)
+            return name
+
+        return run
+
+    futures = [scheduler.submit(call(f"batch{i}"), Priority.BATCH, 1) for i in range(3)]
+    futures.append(scheduler.submit(call("interactive"), Priority.INTERACTIVE, 1))
+
+    for future in futures:
+        future.result(timeout=5)
+
+    assert order == ["interactive", "batch0", "batch1", "batch2"]
+
+
+def test_usage_is_reconciled_against_reserved_tokens():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1000)
+    scheduler = LLMScheduler(limiter, max_concurrency=1)
+
+    def call():
+        return AIMessage(
+            content="ok",
+            usage_metadata={"input_tokens": 90, "output_tokens": 10, "total_tokens": 100},
+        )
+
+    # The estimate exceeds the per-minute budget, so only the full budget is
+    # reserved and the refund must be computed against that reservation.
+    scheduler.submit(call, Priority.INTERACTIVE, 5000).result(timeout=5)
+
+    assert limiter.tokens.wait_time(1000) == pytest.approx(100 / (1000 / 60), abs=0.1)
+
+
+def test_scheduled_model_accepts_strings_and_prompts():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+    llm = ScheduledChatModel(LocalChatModel(), LLMScheduler(limiter, 1), Priority.INTERACTIVE)
+    prompt = ChatPromptTemplate.from_messages([("system", "Be brief."), ("human", "{input}")])
+
+    first = (prompt | llm).invoke({"input": "What was revenue?"})
+    second = (prompt | llm).invoke({"input": "What was revenue?"})
+
+    assert first.content == second.content
+    assert first.content.endswith("What was revenue?")
+    assert llm.invoke("hello").content.endswith("hello")
+
+
+def test_timed_out_call_never_runs_or_spends_budget(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_REQUEST_TIMEOUT", 0.2)
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+
+    # One request per second, with the initial burst already spent.
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1_000_000)
+    limiter.requests.consume(60)
+    drained_at = time.monotonic()
+    scheduler = LLMScheduler(limiter, max_concurrency=1)
+
+    ran = []
+
+    def record(messages):
+        ran.append(messages)
+        return AIMessage(content="too late")
+
+    llm = ScheduledChatModel(RunnableLambda(record), scheduler, Priority.INTERACTIVE)
+
+    with pytest.raises(TimeoutError):
+        llm.invoke("hello")
+
+    # The next call gets the first request that refills after about a second.
+    # It would wait about two seconds if the timed-out call had taken it.
+    ran_at = scheduler.submit(time.monotonic, Priority.INTERACTIVE, 1).result(timeout=5)
+
+    assert ran_at - drained_at < 1.5
+    assert ran == []
+
+
+def test_rate_limit_error_pauses_all_queued_calls():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+    scheduler = LLMScheduler(limiter, max_concurrency=1, max_retries=1)
+
+    failed_at = []
+    started = threading.Event()
+
+    def flaky():
+        if not failed_at:
+            failed_at.append(time.monotonic())
+            started.set()
+            raise rate_limit_error({"retry-after": "0.5"})
+        return "ok"
+
+    first = scheduler.submit(flaky, Priority.INTERACTIVE, 1)
+    assert started.wait(timeout=5)
+    second = scheduler.submit(time.monotonic, Priority.INTERACTIVE, 1)
+
+    assert first.result(timeout=5) == "ok"
+    assert second.result(timeout=5) - failed_at[0] >= 0.5
+
+
+def test_retry_delay_honours_retry_after_headers():
+    assert retry_delay(rate_limit_error({"retry-after-ms": "250"}), 0) == 0.25
+    assert retry_delay(rate_limit_error({"retry-after": "3"}), 0) == 3.0
+    assert retry_delay(rate_limit_error({}), 2) == 2.0
+    assert retry_delay(ValueError("bad input"), 0) is None
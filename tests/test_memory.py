@@ -0,0 +1,125 @@
+import threading
+import pytest
+from langchain_core.runnables import RunnableLambda
+from src.memory import ConversationMemory
+from src.utils import estimate_tokens
+
+
+def wait_for_summary(memory: ConversationMemory) -> None:
+    # The summarizer runs on a single worker, so a no-op queued behind it
+    # completes only once the pending summarization has finished.
+    memory._executor.submit(lambda: None).result(timeout=5)
+
+
+def recording_llm(prompts, reply="summary"):
+    def respond(prompt_value):
+        prompts.append(prompt_value.to_string())
+        return reply
+
+    return RunnableLambda(respond)
+
+
+def window(memory: ConversationMemory):
+    return [(role, content) for role, content in memory.get_history() if role != "system"]
+
+
+def test_window_stays_within_budget():
+    memory = ConversationMemory(recording_llm([]), max_tokens=100)
+
+    for i in range(10):
+        memory.add_turn(f"question {i} " + "q" * 80, f"answer {i} " + "a" * 600)
+        tokens = sum(estimate_tokens(content) for _, content in window(memory))
+        assert tokens <= memory.max_tokens
+
+    wait_for_summary(memory)
+
+
+def test_latest_turn_is_kept_and_evicted_turns_are_summarized():
+    prompts = []
+    memory = ConversationMemory(recording_llm(prompts, "user asked about revenue"), max_tokens=100)
+
+    long_answer = "Revenue was " + "x" * 300 + " total 391 billion"
+    memory.add_turn("What was revenue? " + "r" * 80, long_answer)
+    memory.add_turn("And net income? " + "n" * 80, "n" * 300)
+    memory.add_turn("And margins? " + "m" * 80, "m" * 300)
+    wait_for_summary(memory)
+
+    history = memory.get_history()
+    assert history[0] == (
+        "system",
+        "Summary of the earlier conversation:\nuser asked about revenue",
+    )
+    assert history[1][1].startswith("And net income?")
+    assert len(prompts) == 1
+    assert "What was revenue?" in prompts[0]
+    assert "total 391 billion" in prompts[0]
+    assert f"at most {memory.summary_max_tokens * 3 // 4} words" in prompts[0]
+
+
+def test_clear_during_summarization_discards_stale_summary():
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_summary(prompt_value):
+        started.set()
+        release.wait(timeout=5)
+        return "stale summary"
+
+    memory = ConversationMemory(RunnableLambda(slow_summary), max_tokens=50)
+    memory.add_turn("first " + "q" * 100, "a" * 100)
+    memory.add_turn("second " + "q" * 100, "a" * 100)
+    memory.add_turn("third " + "q" * 100, "a" * 100)
+
+    assert started.wait(timeout=5)
+    memory.clear()
+    release.set()
+    wait_for_summary(memory)
+
+    assert memory.get_history() == []
+
+
+def test_failed_summaries_do_not_grow_pending_batch():
+    def failing_summary(prompt_value):
+        raise RuntimeError("429 Too Many Requests")
+
+    memory = ConversationMemory(RunnableLambda(failing_summary), max_tokens=100)
+
+    for i in range(20):
+        memory.add_turn(f"question {i} " + "q" * 200, f"answer {i} " + "a" * 200)
+        wait_for_summary(memory)
+
+    pending_tokens = sum(estimate_tokens(content) for _, content in memory._pending)
+    assert 0 < pending_tokens <= memory.max_tokens
+    assert memory._pending[-1][1].startswith("answer 17")
+
+
+@pytest.mark.parametrize("max_tokens", [40, 400])
+def test_per_message_cap_applies_only_to_window(max_tokens):
+    memory = ConversationMemory(recording_llm([]), max_tokens=max_tokens)
+    answer = "a" * 4000
+    memory.add_turn("question", answer)
+
+    assert memory._turns[-1][1] == answer
+    assert len(window(memory)[-1][1]) < len(answer)
+
+
+def test_over_long_summary_keeps_newest_facts():
+    def appending_summary(prompt_value):
+        text = prompt_value.to_string()
+        current = text.split("Current summary:\n")[1].split("\n\nNew lines")[0]
+        fact = text.split("FACT")[-1].split(" ")[0]
+        base = "" if current == "(empty)" else current + " "
+        return base + f"FACT{fact} " + "detail " * 20
+
+    memory = ConversationMemory(
+        RunnableLambda(appending_summary), max_tokens=200, summary_max_tokens=100
+    )
+
+    for i in range(8):
+        memory.add_turn(f"FACT{i} question " + "q" * 150, "a" * 150)
+        wait_for_summary(memory)
+
+    summary = memory.get_history()[0]
+    assert summary[0] == "system"
+    assert "FACT5" in summary[1]
+    assert estimate_tokens(summary[1]) <= memory.summary_max_tokens + 10